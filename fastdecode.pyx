@@ -0,0 +1,45 @@
+# cython: language_level=3
+"""
+Compiled decoder for Ollama's streamed NDJSON responses.
+
+Build in place with:
+    python setup.py build_ext --inplace
+
+ollama_chat.py falls back to its pure-Python decoder when this module is not built.
+"""
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+
+def decode_stream(chunks, callback=None):
+    """Parse streamed generate records, pass each piece of text to callback and return the full text"""
+    cdef bytearray buf = bytearray()
+    cdef list parts = []
+    cdef Py_ssize_t start, nl
+    cdef str text
+
+    for chunk in chunks:
+        buf.extend(chunk)
+        start = 0
+        while True:
+            nl = buf.find(b"\n", start)
+            if nl == -1:
+                break
+            if nl > start:
+                text = loads(bytes(buf[start:nl])).get("response", "")
+                parts.append(text)
+                if callback is not None:
+                    callback(text)
+            start = nl + 1
+        del buf[:start]
+
+    if buf.strip():
+        text = loads(bytes(buf)).get("response", "")
+        parts.append(text)
+        if callback is not None:
+            callback(text)
+
+    return "".join(parts)
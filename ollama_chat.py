@@ -1,4 +1,4 @@
-    #!/usr/bin/env python3
+#!/usr/bin/env python3
 """
 Ollama Chat - A wxPython GUI application for local LLM chat with Ollama
 Features:
@@ -12,11 +12,19 @@ Features:
 
 import wx
 import json
+import mmap
 import os
+import re
+import shutil
+import socket
 import subprocess
+import sys
 import threading
 import requests
 import pyttsx3
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -25,12 +33,190 @@ from typing import List, Dict, Optional
 CONFIG_DIR = Path.home() / ".ollama_chat"
 CHATS_DIR = CONFIG_DIR / "chats"
 CONFIG_FILE = CONFIG_DIR / "config.json"
+CHAT_INDEX_FILE = CHATS_DIR / ".index.json"
 OLLAMA_API = "http://localhost:11434"
+STREAM_FLUSH_MS = 40  # How often streamed tokens are pushed to the chat display
+AUTOSAVE_INTERVAL_MS = 5 * 60 * 1000
+MAX_DISPLAY_CHARS = 200000  # Older text is dropped from the display; self.messages keeps it all
+
+# Message box styles
+MSG_ERROR = wx.OK | wx.ICON_ERROR
+MSG_WARNING = wx.OK | wx.ICON_WARNING
+MSG_INFO = wx.OK | wx.ICON_INFORMATION
+MSG_CONFIRM = wx.YES_NO | wx.ICON_QUESTION
+MSG_CONFIRM_CANCEL = wx.YES_NO | wx.CANCEL | wx.ICON_QUESTION
+MSG_CONFIRM_DELETE = wx.YES_NO | wx.ICON_WARNING
+DELETE_CHAT_TITLE = "Confirm Delete"
+DELETE_CHAT_MESSAGE = "Delete this chat? This cannot be undone."
+CHAT_NOT_SAVED_TITLE = "Chat Not Saved"
+CHAT_NOT_SAVED_MESSAGE = "The current chat has not been saved. Only saved chats can be deleted."
+
+# Native task dialog on Windows; the generic rich dialog elsewhere is heavier than a message box
+CONFIRM_DIALOG = wx.RichMessageDialog if sys.platform == "win32" else wx.MessageDialog
+
+# Placed between responses when several are copied to the clipboard
+COPY_SEPARATOR = "\n" + "=" * 50 + "\n"
+
+# Default model options sent with each generate request; num_ctx is only sent when
+# configured, so the model's own context size applies otherwise
+DEFAULT_NUM_BATCH = 512
+
+# Send small writes immediately instead of waiting on delayed ACKs
+TCP_NODELAY_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+
+# Summary fields read from saved chats without loading their messages
+CHAT_META_KEYS = ("created_at", "model", "name")
+
+# Message roles, interned so loaded messages share the same string objects
+ROLE_USER = sys.intern("user")
+ROLE_ASSISTANT = sys.intern("assistant")
+ROLE_LABELS = {ROLE_USER: "You", ROLE_ASSISTANT: "Assistant"}
+ROLE_USER_CODE = 0
+ROLE_ASSISTANT_CODE = 1
+ROLE_NAMES = (ROLE_USER, ROLE_ASSISTANT)
+ROLE_CODES = {ROLE_USER: ROLE_USER_CODE, ROLE_ASSISTANT: ROLE_ASSISTANT_CODE}
+
+# Plain-text transcript format
+TXT_ROLES = {"USER": ROLE_USER_CODE, "ASSISTANT": ROLE_ASSISTANT_CODE}
+TXT_BYTES_ROLES = {b"USER": ROLE_USER_CODE, b"ASSISTANT": ROLE_ASSISTANT_CODE}
+TXT_MESSAGE_RE = re.compile(r'\[(USER|ASSISTANT)\]\n(.*?)(?=\n-{50}|\Z)', re.DOTALL)
+TXT_MODEL_RE = re.compile(r'^Model:\s*(.+)$', re.MULTILINE)
+TXT_DATE_RE = re.compile(r'^Date:\s*(.+)$', re.MULTILINE)
+# Byte patterns for memory-mapped files, which keep their original line endings
+TXT_MESSAGE_BYTES_RE = re.compile(rb'\[(USER|ASSISTANT)\]\r?\n(.*?)(?=\r?\n-{50}|\Z)', re.DOTALL)
+TXT_MODEL_BYTES_RE = re.compile(rb'^Model:\s*(.+)$', re.MULTILINE)
+TXT_DATE_BYTES_RE = re.compile(rb'^Date:\s*(.+)$', re.MULTILINE)
+TXT_MMAP_THRESHOLD = 1024 * 1024
+
+# Shared worker pool for reading chat files; threads are created on demand
+CHAT_IO_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="chat-io")
 
 # Ensure directories exist
 CONFIG_DIR.mkdir(exist_ok=True)
 CHATS_DIR.mkdir(exist_ok=True)
 
+# Optional fast JSON backends (orjson preferred, then ujson, then stdlib)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Optional incremental JSON parser for reading chat metadata
+try:
+    import ijson
+    try:
+        ijson_backend = ijson.get_backend('yajl2_c')
+    except ImportError:
+        ijson_backend = ijson.get_backend('python')
+except ImportError:
+    ijson_backend = None
+
+# Optional httpx client, used instead of requests when installed
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Optional direct clipboard access, used on Windows where it calls the Win32 API through ctypes
+try:
+    import pyperclip
+except ImportError:
+    pyperclip = None
+
+# Optional compiled stream decoder, see setup.py
+try:
+    from fastdecode import decode_stream as fast_decode_stream
+except ImportError:
+    fast_decode_stream = None
+
+if orjson is not None:
+    json_loads = orjson.loads
+elif ujson is not None:
+    json_loads = ujson.loads
+else:
+    json_loads = json.loads
+
+
+def json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes using the fastest available backend"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if ujson is not None:
+        return ujson.dumps(obj, indent=2 if indent else 0, ensure_ascii=False).encode('utf-8')
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def load_config() -> Dict:
+    """Load saved settings, or an empty dict if there are none"""
+    try:
+        with open(CONFIG_FILE, 'rb') as f:
+            return json_loads(f.read())
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error loading settings: {e}")
+    return {}
+
+
+def generation_options(config: Dict) -> Dict:
+    """Build the Ollama model options from settings"""
+    options = {
+        "num_thread": config.get("num_thread", os.cpu_count() or 1),
+        "num_batch": config.get("num_batch", DEFAULT_NUM_BATCH)
+    }
+    if config.get("num_ctx"):
+        options["num_ctx"] = config["num_ctx"]
+    return options
+
+
+def scan_files(dirpath, ext: str) -> List[os.DirEntry]:
+    """List files in dirpath whose names end with ext, using a single scandir pass"""
+    try:
+        with os.scandir(dirpath) as entries:
+            return [e for e in entries if e.name.endswith(ext) and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+def atomic_write(path, data: bytes) -> None:
+    """Write data with a single call to a temp file, then move it over path"""
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        # Don't leave a partial temp file behind, e.g. when the disk is full
+        with suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+class NoDelayAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections set TCP_NODELAY"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = TCP_NODELAY_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
+def create_http_client():
+    """Create an httpx client for the Ollama API, using HTTP/2 when h2 is installed"""
+    if httpx is None:
+        return None
+    try:
+        transport = httpx.HTTPTransport(http2=True, socket_options=TCP_NODELAY_OPTIONS)
+    except ImportError:
+        transport = httpx.HTTPTransport(socket_options=TCP_NODELAY_OPTIONS)
+    return httpx.Client(transport=transport, base_url=OLLAMA_API, timeout=None)
+
+
 # Initialize TTS engine globally
 tts_engine = pyttsx3.init()
 tts_engine.setProperty('rate', 150)  # Speed of speech
@@ -39,11 +225,36 @@ tts_engine.setProperty('rate', 150)  # Speed of speech
 class OllamaManager:
     """Manages Ollama API interactions"""
     
-    @staticmethod
-    def get_models() -> List[str]:
+    # One keep-alive session shared by all calls; requests sessions are safe to use across threads
+    _session = requests.Session()
+    _session.mount("http://", NoDelayAdapter(pool_connections=4, pool_maxsize=8))
+    _session.headers["Connection"] = "keep-alive"
+    # httpx client, preferred over the session when httpx is installed
+    _client = create_http_client()
+    # Set on exit so streaming worker threads stop reading and can finish
+    _stop = threading.Event()
+    
+    @classmethod
+    def stop_streams(cls) -> None:
+        """Stop all in-progress streams after their next chunk arrives"""
+        cls._stop.set()
+    
+    @classmethod
+    def _until_stopped(cls, chunks):
+        """Pass chunks through until stop_streams is called"""
+        for chunk in chunks:
+            if cls._stop.is_set():
+                return
+            yield chunk
+    
+    @classmethod
+    def get_models(cls) -> List[str]:
         """Fetch available models from Ollama"""
         try:
-            response = requests.get(f"{OLLAMA_API}/api/tags", timeout=5)
+            if cls._client is not None:
+                response = cls._client.get("/api/tags", timeout=5)
+            else:
+                response = cls._session.get(f"{OLLAMA_API}/api/tags", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 models = data.get("models", [])
@@ -52,88 +263,228 @@ class OllamaManager:
             print(f"Error fetching models: {e}")
         return []
     
-    @staticmethod
-    def pull_model(model_name: str, callback=None) -> bool:
-        """Download a model from Ollama"""
-        try:
-            response = requests.post(
-                f"{OLLAMA_API}/api/pull",
-                json={"name": model_name},
+    @classmethod
+    @contextmanager
+    def _stream_post(cls, path: str, payload: Dict, headers: Optional[Dict] = None):
+        """POST to the API and yield the status code and an iterator over body chunks"""
+        if cls._client is not None:
+            with cls._client.stream("POST", path, json=payload, headers=headers) as response:
+                yield response.status_code, cls._until_stopped(response.iter_bytes())
+        else:
+            with cls._session.post(
+                f"{OLLAMA_API}{path}",
+                json=payload,
+                headers=headers,
                 stream=True,
                 timeout=None
-            )
-            if response.status_code == 200:
-                for line in response.iter_lines():
-                    if callback:
-                        callback(line.decode() if isinstance(line, bytes) else line)
-                return True
+            ) as response:
+                chunks = response.raw.stream(8192, decode_content=True)
+                yield response.status_code, cls._until_stopped(chunks)
+    
+    @classmethod
+    def pull_model(cls, model_name: str, callback=None) -> bool:
+        """Download a model from Ollama"""
+        try:
+            with cls._stream_post("/api/pull", {"name": model_name}) as (status, chunks):
+                if status == 200:
+                    for line in cls._iter_ndjson(chunks):
+                        if callback:
+                            callback(line.decode())
+                    return True
         except Exception as e:
             print(f"Error pulling model: {e}")
         return False
     
     @staticmethod
-    def generate_response(model: str, prompt: str, callback=None) -> str:
+    def _iter_ndjson(chunks):
+        """Yield each newline-delimited record as soon as its newline arrives"""
+        buf = bytearray()
+        for chunk in chunks:
+            buf.extend(chunk)
+            start = 0
+            while True:
+                nl = buf.find(b"\n", start)
+                if nl == -1:
+                    break
+                if nl > start:
+                    yield bytes(buf[start:nl])
+                start = nl + 1
+            del buf[:start]
+        if buf.strip():
+            yield bytes(buf)
+    
+    @classmethod
+    def _decode_stream(cls, chunks, callback=None) -> str:
+        """Parse streamed generate records, pass each piece of text to callback and return the full text"""
+        parts = []
+        for line in cls._iter_ndjson(chunks):
+            response_text = json_loads(line).get("response", "")
+            parts.append(response_text)
+            if callback:
+                callback(response_text)
+        return "".join(parts)
+    
+    @classmethod
+    def generate_response(cls, model: str, prompt: str, callback=None, options: Optional[Dict] = None) -> str:
         """Generate response from Ollama"""
         try:
-            response = requests.post(
-                f"{OLLAMA_API}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": True
-                },
-                stream=True,
-                timeout=None
-            )
-            
-            full_response = ""
-            if response.status_code == 200:
-                for line in response.iter_lines():
-                    if line:
-                        data = json.loads(line)
-                        response_text = data.get("response", "")
-                        full_response += response_text
-                        if callback:
-                            callback(response_text)
-            return full_response
+            payload = {
+                "model": model,
+                "prompt": prompt,
+                "stream": True
+            }
+            if options:
+                payload["options"] = options
+            # Compressed streams are buffered, which delays each token
+            headers = {"Accept-Encoding": "identity"}
+            with cls._stream_post("/api/generate", payload, headers) as (status, chunks):
+                if status != 200:
+                    return ""
+                decode = fast_decode_stream or cls._decode_stream
+                return decode(chunks, callback)
         except Exception as e:
             error_msg = f"Error generating response: {e}"
             print(error_msg)
             return error_msg
 
 
+class MessageLog:
+    """Chat messages stored as parallel lists of role codes and contents"""
+    
+    __slots__ = ("roles", "contents", "role_names")
+    
+    def __init__(self):
+        self.roles: List[int] = []
+        self.contents: List[str] = []
+        # Role names by code; roles other than user/assistant get a code in this log when first seen
+        self.role_names: List[str] = list(ROLE_NAMES)
+    
+    def code_for(self, role: str) -> int:
+        """Get the code for a role name"""
+        code = ROLE_CODES.get(role)
+        if code is not None:
+            return code
+        try:
+            return self.role_names.index(role, len(ROLE_NAMES))
+        except ValueError:
+            self.role_names.append(sys.intern(role))
+            return len(self.role_names) - 1
+    
+    def append(self, role_code: int, content: str) -> None:
+        """Add a message"""
+        self.roles.append(role_code)
+        self.contents.append(content)
+    
+    def contents_of(self, role_code: int) -> List[str]:
+        """Get the contents of all messages with the given role"""
+        return [c for r, c in zip(self.roles, self.contents) if r == role_code]
+    
+    def __len__(self) -> int:
+        return len(self.contents)
+    
+    def __iter__(self):
+        """Iterate over (role name, content) pairs"""
+        names = self.role_names
+        return ((names[r], c) for r, c in zip(self.roles, self.contents))
+
+
 class ChatManager:
     """Manages chat history and persistence"""
     
     @staticmethod
     def get_chat_list() -> List[Dict]:
         """Get list of saved chats"""
-        chats = []
-        if CHATS_DIR.exists():
-            for chat_file in CHATS_DIR.glob("*.json"):
-                try:
-                    with open(chat_file, 'r') as f:
-                        chat = json.load(f)
-                        chats.append(chat)
-                except Exception as e:
-                    print(f"Error loading chat: {e}")
-        return sorted(chats, key=lambda x: x.get("created_at", ""), reverse=True)
+        entries = scan_files(CHATS_DIR, ".json")
+        if not entries:
+            return []
+        
+        # Reuse cached metadata for files whose mtime and size are unchanged
+        index = ChatManager._load_index()
+        chats = {}
+        stale = []
+        for entry in entries:
+            if entry.name == CHAT_INDEX_FILE.name:
+                continue
+            stat = entry.stat()
+            cached = index.get(entry.name)
+            if cached and cached.get("mtime_ns") == stat.st_mtime_ns and cached.get("size") == stat.st_size:
+                chats[entry.name] = cached
+            else:
+                stale.append((entry.name, entry.path, stat))
+        
+        paths = [path for _, path, _ in stale]
+        for (name, _, stat), meta in zip(stale, CHAT_IO_EXECUTOR.map(ChatManager._load_one, paths)):
+            if meta is not None:
+                meta["mtime_ns"] = stat.st_mtime_ns
+                meta["size"] = stat.st_size
+                chats[name] = meta
+        
+        if chats != index:
+            ChatManager._save_index(chats)
+        # The mtime and size are only for the index; callers get the summary fields
+        summaries = [{key: meta[key] for key in CHAT_META_KEYS if key in meta} for meta in chats.values()]
+        return sorted(summaries, key=lambda x: x.get("created_at", ""), reverse=True)
     
     @staticmethod
-    def save_chat(filepath: str, messages: List[Dict], model: str) -> bool:
-        """Save chat to text file"""
+    def _load_index() -> Dict:
+        """Load the cached chat metadata index"""
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"=== Ollama Chat ===\n")
-                f.write(f"Model: {model}\n")
-                f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 50 + "\n\n")
-                
-                for msg in messages:
-                    role = msg.get("role", "Unknown").upper()
-                    content = msg.get("content", "")
-                    f.write(f"[{role}]\n{content}\n\n")
-                    f.write("-" * 50 + "\n\n")
+            with open(CHAT_INDEX_FILE, 'rb') as f:
+                return json_loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading chat index: {e}")
+        return {}
+    
+    @staticmethod
+    def _save_index(index: Dict) -> None:
+        """Atomically write the chat metadata index"""
+        try:
+            atomic_write(CHAT_INDEX_FILE, json_dumps(index))
+        except Exception as e:
+            print(f"Error saving chat index: {e}")
+    
+    @staticmethod
+    def _load_one(chat_file) -> Optional[Dict]:
+        """Read one chat's metadata on a worker thread"""
+        try:
+            return ChatManager.read_chat_metadata(chat_file)
+        except Exception as e:
+            print(f"Error loading chat: {e}")
+            return None
+    
+    @staticmethod
+    def read_chat_metadata(chat_file) -> Dict:
+        """Read only the summary fields of a saved chat, skipping its messages"""
+        with open(chat_file, 'rb') as f:
+            if ijson_backend is None:
+                chat = json_loads(f.read())
+                return {key: chat[key] for key in CHAT_META_KEYS if key in chat}
+            
+            meta = {}
+            for prefix, event, value in ijson_backend.parse(f, use_float=True):
+                if prefix in CHAT_META_KEYS and event in ("string", "number"):
+                    meta[prefix] = value
+                    if len(meta) == len(CHAT_META_KEYS):
+                        break
+            return meta
+    
+    @staticmethod
+    def save_chat(filepath: str, messages: MessageLog, model: str, date: Optional[str] = None) -> bool:
+        """Save chat as JSON lines: a header record followed by one record per message"""
+        try:
+            header = {
+                "_header": True,
+                "model": model,
+                "date": date or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            parts = [json_dumps(header)]
+            for role, content in messages:
+                parts.append(json_dumps({"role": role, "content": content}))
+            parts.append(b"")
+            
+            atomic_write(filepath, b"\n".join(parts))
             
             return True
         except Exception as e:
@@ -141,60 +492,94 @@ class ChatManager:
             return False
     
     @staticmethod
-    def load_chat_from_txt(filepath: str) -> Optional[Dict]:
-        """Load chat from text file"""
+    def load_chat(filepath: str) -> Optional[Dict]:
+        """Load a saved chat; plain-text transcripts are flagged for migration, not rewritten"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            lines = content.split('\n')
-            model = "Unknown"
-            messages = []
-            current_role = None
-            current_content = []
-            
-            # Parse the file
-            for line in lines:
-                if line.startswith("Model: "):
-                    model = line.replace("Model: ", "").strip()
-                elif line.startswith("[USER]"):
-                    if current_role and current_content:
-                        messages.append({
-                            "role": current_role,
-                            "content": '\n'.join(current_content).strip()
-                        })
-                    current_role = "user"
-                    current_content = []
-                elif line.startswith("[ASSISTANT]"):
-                    if current_role and current_content:
-                        messages.append({
-                            "role": current_role,
-                            "content": '\n'.join(current_content).strip()
-                        })
-                    current_role = "assistant"
-                    current_content = []
-                elif line.startswith("-" * 50):
-                    if current_role and current_content:
-                        messages.append({
-                            "role": current_role,
-                            "content": '\n'.join(current_content).strip()
-                        })
-                    current_role = None
-                    current_content = []
-                elif current_role and not line.startswith("===") and not line.startswith("Date:"):
-                    current_content.append(line)
+            with open(filepath, 'rb') as f:
+                head = f.read(64).lstrip()
+        except Exception as e:
+            print(f"Error loading chat: {e}")
+            return None
+        
+        if not head or head.startswith(b"{"):
+            return ChatManager.load_chat_from_jsonl(filepath)
+        
+        return ChatManager.load_chat_from_txt(filepath)
+    
+    @staticmethod
+    def migrate_chat(filepath: str, chat: Dict) -> bool:
+        """Rewrite a plain-text transcript as JSON lines, keeping the original as .bak"""
+        try:
+            shutil.copy2(filepath, f"{filepath}.bak")
+        except Exception as e:
+            print(f"Could not back up {filepath}, leaving it unmigrated: {e}")
+            return False
+        if not ChatManager.save_chat(filepath, chat["messages"], chat["model"], chat.get("date")):
+            print(f"Could not migrate {filepath} to the JSON lines format")
+            return False
+        chat["needs_migration"] = False
+        chat["jsonl"] = True
+        return True
+    
+    @staticmethod
+    def load_chat_from_jsonl(filepath: str) -> Optional[Dict]:
+        """Load chat from a JSON lines file"""
+        try:
+            with open(filepath, 'rb') as f:
+                records = [json_loads(line) for line in f if line.strip()]
             
-            # Add last message if exists
-            if current_role and current_content:
-                messages.append({
-                    "role": current_role,
-                    "content": '\n'.join(current_content).strip()
-                })
+            # A chat starts with its header record; any other JSON file is not a chat
+            if not records or not isinstance(records[0], dict) or not records[0].get("_header"):
+                return None
+            header = records[0]
+            messages = MessageLog()
+            for r in records[1:]:
+                if not r.get("_header"):
+                    messages.append(messages.code_for(r.get("role", "Unknown")), r.get("content", ""))
+            return {
+                "model": header.get("model", "Unknown"),
+                "date": header.get("date"),
+                "messages": messages,
+                "name": Path(filepath).stem,
+                "jsonl": True
+            }
+        except Exception as e:
+            print(f"Error loading chat: {e}")
+            return None
+    
+    @staticmethod
+    def load_chat_from_txt(filepath: str) -> Optional[Dict]:
+        """Load chat from a legacy plain-text transcript"""
+        try:
+            if os.path.getsize(filepath) >= TXT_MMAP_THRESHOLD:
+                # Scan large transcripts in place instead of copying them into a str
+                with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    model_match = TXT_MODEL_BYTES_RE.search(data)
+                    model = model_match.group(1).decode('utf-8').strip() if model_match else "Unknown"
+                    date_match = TXT_DATE_BYTES_RE.search(data)
+                    date = date_match.group(1).decode('utf-8').strip() if date_match else None
+                    messages = MessageLog()
+                    for m in TXT_MESSAGE_BYTES_RE.finditer(data):
+                        content = m.group(2).decode('utf-8').replace('\r\n', '\n').strip()
+                        messages.append(TXT_BYTES_ROLES[m.group(1)], content)
+            else:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                model_match = TXT_MODEL_RE.search(content)
+                model = model_match.group(1).strip() if model_match else "Unknown"
+                date_match = TXT_DATE_RE.search(content)
+                date = date_match.group(1).strip() if date_match else None
+                messages = MessageLog()
+                for m in TXT_MESSAGE_RE.finditer(content):
+                    messages.append(TXT_ROLES[m.group(1)], m.group(2).strip())
             
             return {
                 "model": model,
+                "date": date,
                 "messages": messages,
-                "name": Path(filepath).stem
+                "name": Path(filepath).stem,
+                # Only a file with a Model: header and at least one message is a real transcript
+                "needs_migration": model_match is not None and len(messages) > 0
             }
         except Exception as e:
             print(f"Error loading chat: {e}")
@@ -311,7 +696,7 @@ class ModelManagerDialog(wx.Dialog):
         """Handle model download"""
         model_name = self.model_input.GetValue().strip()
         if not model_name:
-            wx.MessageBox("Please enter a model name", "Input Error", wx.OK | wx.ICON_ERROR)
+            wx.MessageBox("Please enter a model name", "Input Error", MSG_ERROR)
             return
         
         self.progress.SetValue(0)
@@ -322,14 +707,13 @@ class ModelManagerDialog(wx.Dialog):
             wx.CallAfter(self.load_models)
             wx.CallAfter(self.progress_text.SetLabel, f"Downloaded {model_name}")
         
-        thread = threading.Thread(target=download_thread)
-        thread.daemon = True
-        thread.start()
+        # Pulls can run for a long time, so use a daemon thread that cannot delay exit
+        threading.Thread(target=download_thread, daemon=True).start()
     
     def update_progress(self, message):
         """Update progress during download"""
         try:
-            data = json.loads(message) if isinstance(message, str) else message
+            data = json_loads(message) if isinstance(message, str) else message
             if "total" in data and "completed" in data:
                 progress = int((data["completed"] / data["total"]) * 100)
                 wx.CallAfter(self.progress.SetValue, progress)
@@ -341,7 +725,7 @@ class SettingsDialog(wx.Dialog):
     """Dialog for application settings"""
     
     def __init__(self, parent, tts_manager):
-        super().__init__(parent, title="Settings", size=(400, 400))
+        super().__init__(parent, title="Settings", size=(400, 520))
         self.tts_manager = tts_manager
         self.init_ui()
         self.load_settings()
@@ -393,6 +777,38 @@ class SettingsDialog(wx.Dialog):
         volume_sizer.Add(self.volume_slider, 1, wx.EXPAND | wx.ALL, 5)
         main_sizer.Add(volume_sizer, 0, wx.EXPAND | wx.ALL, 5)
         
+        # Model options
+        options_label = wx.StaticText(self, label="Model Options")
+        options_label.SetFont(options_label.GetFont().MakeBold())
+        main_sizer.Add(options_label, 0, wx.ALL, 5)
+        
+        # CPU threads
+        thread_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        thread_label = wx.StaticText(self, label="CPU Threads:")
+        self.num_thread_spin = wx.SpinCtrl(self, min=1, max=256, name="CPU threads")
+        self.num_thread_spin.SetToolTip("Number of CPU threads Ollama uses to generate")
+        thread_sizer.Add(thread_label, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        thread_sizer.Add(self.num_thread_spin, 1, wx.EXPAND | wx.ALL, 5)
+        main_sizer.Add(thread_sizer, 0, wx.EXPAND | wx.ALL, 5)
+        
+        # Context size
+        ctx_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        ctx_label = wx.StaticText(self, label="Context Size:")
+        self.num_ctx_spin = wx.SpinCtrl(self, min=0, max=131072, name="Context size")
+        self.num_ctx_spin.SetToolTip("Size of the context window in tokens; 0 uses the model's default")
+        ctx_sizer.Add(ctx_label, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        ctx_sizer.Add(self.num_ctx_spin, 1, wx.EXPAND | wx.ALL, 5)
+        main_sizer.Add(ctx_sizer, 0, wx.EXPAND | wx.ALL, 5)
+        
+        # Batch size
+        batch_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        batch_label = wx.StaticText(self, label="Batch Size:")
+        self.num_batch_spin = wx.SpinCtrl(self, min=1, max=4096, name="Batch size")
+        self.num_batch_spin.SetToolTip("Number of prompt tokens processed at once")
+        batch_sizer.Add(batch_label, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        batch_sizer.Add(self.num_batch_spin, 1, wx.EXPAND | wx.ALL, 5)
+        main_sizer.Add(batch_sizer, 0, wx.EXPAND | wx.ALL, 5)
+        
         # Buttons
         btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
         save_btn = wx.Button(self, wx.ID_SAVE)
@@ -409,17 +825,17 @@ class SettingsDialog(wx.Dialog):
     def load_settings(self):
         """Load settings from config file"""
         try:
-            if CONFIG_FILE.exists():
-                with open(CONFIG_FILE, 'r') as f:
-                    config = json.load(f)
-                    self.api_input.SetValue(config.get("api_url", OLLAMA_API))
-                    self.theme_choice.SetSelection(0 if config.get("theme", "Light") == "Light" else 1)
-                    self.autosave_cb.SetValue(config.get("autosave", False))
-                    self.rate_slider.SetValue(config.get("tts_rate", 150))
-                    self.volume_slider.SetValue(config.get("tts_volume", 100))
-            else:
-                self.api_input.SetValue(OLLAMA_API)
-                self.theme_choice.SetSelection(0)
+            config = load_config()
+            self.api_input.SetValue(config.get("api_url", OLLAMA_API))
+            self.theme_choice.SetSelection(0 if config.get("theme", "Light") == "Light" else 1)
+            self.autosave_cb.SetValue(config.get("autosave", False))
+            self.rate_slider.SetValue(config.get("tts_rate", 150))
+            self.volume_slider.SetValue(config.get("tts_volume", 100))
+            
+            options = generation_options(config)
+            self.num_thread_spin.SetValue(options["num_thread"])
+            self.num_ctx_spin.SetValue(options.get("num_ctx", 0))
+            self.num_batch_spin.SetValue(options["num_batch"])
         except Exception as e:
             print(f"Error loading settings: {e}")
     
@@ -431,18 +847,21 @@ class SettingsDialog(wx.Dialog):
                 "theme": self.theme_choice.GetStringSelection(),
                 "autosave": self.autosave_cb.GetValue(),
                 "tts_rate": self.rate_slider.GetValue(),
-                "tts_volume": self.volume_slider.GetValue()
+                "tts_volume": self.volume_slider.GetValue(),
+                "num_thread": self.num_thread_spin.GetValue(),
+                "num_batch": self.num_batch_spin.GetValue()
             }
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(config, f, indent=2)
+            if self.num_ctx_spin.GetValue():
+                config["num_ctx"] = self.num_ctx_spin.GetValue()
+            atomic_write(CONFIG_FILE, json_dumps(config, indent=True))
             
             # Update TTS settings
             self.tts_manager.set_rate(self.rate_slider.GetValue())
             self.tts_manager.set_volume(self.volume_slider.GetValue() / 100.0)
             
-            wx.MessageBox("Settings saved successfully", "Success", wx.OK | wx.ICON_INFORMATION)
+            wx.MessageBox("Settings saved successfully", "Success", MSG_INFO)
         except Exception as e:
-            wx.MessageBox(f"Error saving settings: {e}", "Error", wx.OK | wx.ICON_ERROR)
+            wx.MessageBox(f"Error saving settings: {e}", "Error", MSG_ERROR)
 
 
 class ChatHistoryDialog(wx.Dialog):
@@ -451,6 +870,7 @@ class ChatHistoryDialog(wx.Dialog):
     def __init__(self, parent):
         super().__init__(parent, title="Chat History", size=(500, 400))
         self.parent_frame = parent
+        self.selected_chat = None
         self.init_ui()
         self.load_history()
     
@@ -485,57 +905,104 @@ class ChatHistoryDialog(wx.Dialog):
     
     def load_history(self):
         """Load chat history from txt files"""
-        self.chat_files = []
-        if CHATS_DIR.exists():
-            for chat_file in CHATS_DIR.glob("*.txt"):
-                self.chat_files.append(chat_file)
+        # Keep plain file names; paths are only built when a chat is loaded or deleted
+        self.chat_files = [entry.name for entry in scan_files(CHATS_DIR, ".txt")]
         
-        chat_names = [f.stem for f in self.chat_files]
+        chat_names = [os.path.splitext(name)[0] for name in self.chat_files]
         self.chat_list.Set(chat_names)
     
     def on_load_chat(self, event):
-        """Load selected chat"""
+        """Load selected chat and close; the parent applies it once the dialog is gone"""
         selection = self.chat_list.GetSelection()
         if selection != wx.NOT_FOUND and selection < len(self.chat_files):
-            chat = ChatManager.load_chat_from_txt(str(self.chat_files[selection]))
+            filepath = str(CHATS_DIR / self.chat_files[selection])
+            chat = ChatManager.load_chat(filepath)
             if chat:
-                self.parent_frame.load_chat_data(chat)
+                self.selected_chat = (chat, filepath)
                 self.EndModal(wx.ID_OK)
     
+    def get_selection(self):
+        """Return the (chat, filepath) pair loaded by the user, or None"""
+        return self.selected_chat
+    
     def on_delete_chat(self, event):
         """Delete selected chat"""
         selection = self.chat_list.GetSelection()
         if selection != wx.NOT_FOUND and selection < len(self.chat_files):
-            dlg = wx.MessageDialog(
+            chat_file = CHATS_DIR / self.chat_files[selection]
+            with wx.MessageDialog(
                 self,
-                f"Delete '{self.chat_files[selection].stem}'? This cannot be undone.",
-                "Confirm Delete",
-                wx.YES_NO | wx.ICON_QUESTION
-            )
-            if dlg.ShowModal() == wx.ID_YES:
-                try:
-                    self.chat_files[selection].unlink()
-                    wx.MessageBox("Chat deleted successfully", "Success", wx.OK | wx.ICON_INFORMATION)
-                    self.load_history()
-                except Exception as e:
-                    wx.MessageBox(f"Error deleting chat: {e}", "Error", wx.OK | wx.ICON_ERROR)
-            dlg.Destroy()
+                f"Delete '{chat_file.stem}'? This cannot be undone.",
+                DELETE_CHAT_TITLE,
+                MSG_CONFIRM
+            ) as dlg:
+                if dlg.ShowModal() != wx.ID_YES:
+                    return
+            
+            try:
+                chat_file.unlink()
+                self.parent_frame.forget_chat_file(str(chat_file))
+                wx.MessageBox("Chat deleted successfully", "Success", MSG_INFO)
+                self.load_history()
+            except Exception as e:
+                wx.MessageBox(f"Error deleting chat: {e}", "Error", MSG_ERROR)
 
 
 class MainFrame(wx.Frame):
     """Main application window"""
     
+    # Options popup menu entries: (label, handler method name); None marks a separator
+    _MENU_SPEC = [
+        ("Settings", "show_settings"),
+        ("Model Manager", "show_model_manager"),
+        ("Chat History", "show_chat_history"),
+        ("Delete Current Chat", "on_delete_current_chat"),
+        (None, None),
+        ("Exit", "on_exit"),
+    ]
+    
     def __init__(self):
         super().__init__(None, title="Ollama Chat", size=(900, 700))
         self.current_chat_file = None
-        self.is_saved = False
-        self.messages = []
+        # Only files this app wrote or loaded as JSON lines chats are autosaved over
+        self._autosave_path = None
+        self._set_messages(MessageLog())
         self.tts_manager = TTSManager()
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ollama")
+        self._stream_buf = []
+        self._stream_lock = threading.Lock()
+        self._stream_pending = False
         self.init_ui()
+        self._stream_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._flush_stream, self._stream_timer)
+        self._autosave_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_autosave, self._autosave_timer)
+        # Every way of closing the window, including the title bar, goes through on_close
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.apply_settings()
         self.bind_shortcuts()
         self.load_models()
         self.Centre()
     
+    def _mark_saved(self):
+        """Record the current content as saved"""
+        self._dirty = False
+    
+    def _set_messages(self, messages: MessageLog):
+        """Replace the chat messages and rebuild the state derived from them"""
+        self.messages = messages
+        self._assistant_responses = messages.contents_of(ROLE_ASSISTANT_CODE)
+        self._copy_text = None
+        self._mark_saved()
+    
+    def _add_message(self, role_code: int, content: str):
+        """Append a message; the chat now differs from what was saved"""
+        self.messages.append(role_code, content)
+        if role_code == ROLE_ASSISTANT_CODE:
+            self._assistant_responses.append(content)
+            self._copy_text = None
+        self._dirty = True
+    
     def init_ui(self):
         """Initialize main UI"""
         # Main panel
@@ -615,6 +1082,7 @@ class MainFrame(wx.Frame):
         
         main_panel.SetSizer(main_sizer)
         self.create_menu_bar()
+        self.create_popup_menu()
     
     def create_menu_bar(self):
         """Create menu bar"""
@@ -642,6 +1110,25 @@ class MainFrame(wx.Frame):
         self.Bind(wx.EVT_MENU, self.on_save_chat, id=wx.ID_SAVE)
         self.Bind(wx.EVT_MENU, self.on_exit, id=wx.ID_EXIT)
     
+    def create_popup_menu(self):
+        """Create the options popup menu once; it is reused on every Ctrl+Shift+O"""
+        self._popup_menu = wx.Menu()
+        for label, handler in self._MENU_SPEC:
+            if label is None:
+                self._popup_menu.AppendSeparator()
+                continue
+            item = self._popup_menu.Append(wx.ID_ANY, label)
+            self.Bind(wx.EVT_MENU, getattr(self, handler), item)
+        
+        # The menu is not owned by the frame, so release it when the frame goes away
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+    
+    def on_destroy(self, event):
+        """Release resources the frame does not own"""
+        if event.GetEventObject() is self:
+            self._popup_menu.Destroy()
+        event.Skip()
+    
     def bind_shortcuts(self):
         """Bind keyboard shortcuts"""
         self.Bind(wx.EVT_CHAR_HOOK, self.on_char_hook)
@@ -681,13 +1168,12 @@ class MainFrame(wx.Frame):
     
     def load_models(self):
         """Load available models"""
-        def load_thread():
-            models = OllamaManager.get_models()
-            wx.CallAfter(self.update_models, models)
+        def on_done(future):
+            # Futures cancelled by the pool shutdown on close still run their callbacks
+            if not future.cancelled():
+                wx.CallAfter(self.update_models, future.result())
         
-        thread = threading.Thread(target=load_thread)
-        thread.daemon = True
-        thread.start()
+        self._pool.submit(OllamaManager.get_models).add_done_callback(on_done)
     
     def update_models(self, models):
         """Update model choice"""
@@ -707,52 +1193,80 @@ class MainFrame(wx.Frame):
         """Send message to LLM"""
         message = self.user_input.GetValue().strip()
         if not message:
-            wx.MessageBox("Please enter a message", "Input Error", wx.OK | wx.ICON_WARNING)
+            wx.MessageBox("Please enter a message", "Input Error", MSG_WARNING)
             return
         
         if self.model_choice.GetSelection() == wx.NOT_FOUND:
-            wx.MessageBox("Please select a model first", "Model Error", wx.OK | wx.ICON_ERROR)
+            wx.MessageBox("Please select a model first", "Model Error", MSG_ERROR)
             return
         
         model = self.model_choice.GetStringSelection()
         
         # Add user message to display
         self.chat_display.AppendText(f"\nYou: {message}\n")
-        self.messages.append({"role": "user", "content": message})
+        self._add_message(ROLE_USER_CODE, message)
         self.user_input.Clear()
         self.status_bar.SetStatusText("Generating response...")
         
-        # Generate response in thread
-        def response_thread():
-            response = OllamaManager.generate_response(model, message, self.append_response)
+        # Generate on a daemon thread rather than the pool: the interpreter joins pool
+        # workers at exit, and a stream can block for minutes while the model loads
+        def generate():
+            response = OllamaManager.generate_response(
+                model, message, self.append_response, self.generation_options
+            )
             wx.CallAfter(self.finalize_response, response)
         
-        thread = threading.Thread(target=response_thread)
-        thread.daemon = True
-        thread.start()
+        threading.Thread(target=generate, daemon=True).start()
     
     def append_response(self, text):
-        """Append response text as it streams"""
-        wx.CallAfter(self.chat_display.AppendText, text)
+        """Buffer response text as it streams; the display is updated by a timer"""
+        with self._stream_lock:
+            self._stream_buf.append(text)
+            if self._stream_pending:
+                return
+            self._stream_pending = True
+        wx.CallAfter(self._stream_timer.StartOnce, STREAM_FLUSH_MS)
+    
+    def _flush_stream(self, event=None):
+        """Write buffered response text to the chat display"""
+        with self._stream_lock:
+            text = ''.join(self._stream_buf)
+            self._stream_buf.clear()
+            self._stream_pending = False
+        if text:
+            display = self.chat_display
+            display.Freeze()
+            try:
+                display.SetInsertionPointEnd()
+                display.WriteText(text)
+                self._trim_display()
+            finally:
+                display.Thaw()
+    
+    def _trim_display(self):
+        """Drop the oldest text so the display stays under MAX_DISPLAY_CHARS"""
+        excess = self.chat_display.GetLastPosition() - MAX_DISPLAY_CHARS
+        if excess > 0:
+            self.chat_display.Remove(0, excess)
     
     def finalize_response(self, response):
         """Finalize response after generation"""
-        self.messages.append({"role": "assistant", "content": response})
+        self._stream_timer.Stop()
+        self._flush_stream()
+        self._add_message(ROLE_ASSISTANT_CODE, response)
         self.chat_display.AppendText("\n")
         self.status_bar.SetStatusText("Ready")
-        self.is_saved = False
     
     def on_new_chat(self, event):
         """Start new chat"""
-        if self.messages and not self.is_saved:
-            dlg = wx.MessageDialog(
+        if self._dirty:
+            with wx.MessageDialog(
                 self,
                 "Current chat is not saved. Save before starting a new chat?",
                 "Unsaved Changes",
-                wx.YES_NO | wx.CANCEL | wx.ICON_QUESTION
-            )
-            result = dlg.ShowModal()
-            dlg.Destroy()
+                MSG_CONFIRM_CANCEL
+            ) as dlg:
+                result = dlg.ShowModal()
             
             if result == wx.ID_YES:
                 self.on_save_chat(None)
@@ -761,92 +1275,113 @@ class MainFrame(wx.Frame):
         
         self.chat_display.Clear()
         self.user_input.Clear()
-        self.messages = []
+        self._set_messages(MessageLog())
         self.current_chat_file = None
-        self.is_saved = False
+        self._autosave_path = None
         self.status_bar.SetStatusText("New chat started")
     
     def on_open_chat(self, event):
         """Open a saved chat file using native file dialog"""
         wildcard = "Text files (*.txt)|*.txt|All files (*.*)|*.*"
-        dlg = wx.FileDialog(
+        with wx.FileDialog(
             self,
             "Open Chat",
             defaultDir=str(CHATS_DIR),
             wildcard=wildcard,
             style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST
-        )
-        
-        if dlg.ShowModal() == wx.ID_OK:
+        ) as dlg:
+            if dlg.ShowModal() != wx.ID_OK:
+                return
             filepath = dlg.GetPath()
-            chat = ChatManager.load_chat_from_txt(filepath)
+        
+        chat = ChatManager.load_chat(filepath)
+        if not chat:
+            wx.MessageBox("Error loading chat file", "Error", MSG_ERROR)
+            return
+        
+        # Ask if user wants to save current unsaved chat
+        if self._dirty:
+            with wx.MessageDialog(
+                self,
+                "Current chat is not saved. Save before opening another chat?",
+                "Unsaved Changes",
+                MSG_CONFIRM_CANCEL
+            ) as save_dlg:
+                result = save_dlg.ShowModal()
             
-            if chat:
-                # Ask if user wants to save current unsaved chat
-                if self.messages and not self.is_saved:
-                    save_dlg = wx.MessageDialog(
-                        self,
-                        "Current chat is not saved. Save before opening another chat?",
-                        "Unsaved Changes",
-                        wx.YES_NO | wx.CANCEL | wx.ICON_QUESTION
-                    )
-                    result = save_dlg.ShowModal()
-                    save_dlg.Destroy()
-                    
-                    if result == wx.ID_YES:
-                        self.on_save_chat(None)
-                    elif result == wx.ID_CANCEL:
-                        dlg.Destroy()
-                        return
-                
-                self.load_chat_data(chat, filepath)
-                self.status_bar.SetStatusText(f"Opened: {Path(filepath).name}")
-            else:
-                wx.MessageBox("Error loading chat file", "Error", wx.OK | wx.ICON_ERROR)
+            if result == wx.ID_YES:
+                self.on_save_chat(None)
+            elif result == wx.ID_CANCEL:
+                return
         
-        dlg.Destroy()
+        if chat.get("needs_migration"):
+            ChatManager.migrate_chat(filepath, chat)
+        self.load_chat_data(chat, filepath)
+        self.status_bar.SetStatusText(f"Opened: {Path(filepath).name}")
     
     def on_save_chat(self, event):
         """Save current chat using native file dialog"""
         if not self.messages:
-            wx.MessageBox("No messages to save", "Empty Chat", wx.OK | wx.ICON_WARNING)
+            wx.MessageBox("No messages to save", "Empty Chat", MSG_WARNING)
             return
         
         if self.model_choice.GetSelection() == wx.NOT_FOUND:
-            wx.MessageBox("Please select a model first", "Model Error", wx.OK | wx.ICON_ERROR)
+            wx.MessageBox("Please select a model first", "Model Error", MSG_ERROR)
             return
         
         # Use native file save dialog
         wildcard = "Text files (*.txt)|*.txt|All files (*.*)|*.*"
-        dlg = wx.FileDialog(
+        with wx.FileDialog(
             self,
             "Save Chat As",
             defaultDir=str(CHATS_DIR),
             defaultFile=f"chat_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
             wildcard=wildcard,
             style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT
-        )
-        
-        if dlg.ShowModal() == wx.ID_OK:
+        ) as dlg:
+            if dlg.ShowModal() != wx.ID_OK:
+                return
             filepath = dlg.GetPath()
-            model = self.model_choice.GetStringSelection()
-            
-            if ChatManager.save_chat(filepath, self.messages, model):
-                self.current_chat_file = filepath
-                self.is_saved = True
-                self.status_bar.SetStatusText(f"Chat saved: {Path(filepath).name}")
-                wx.MessageBox("Chat saved successfully", "Success", wx.OK | wx.ICON_INFORMATION)
-            else:
-                wx.MessageBox("Error saving chat", "Error", wx.OK | wx.ICON_ERROR)
         
-        dlg.Destroy()
+        model = self.model_choice.GetStringSelection()
+        if ChatManager.save_chat(filepath, self.messages, model):
+            self.current_chat_file = filepath
+            self._autosave_path = filepath
+            self._mark_saved()
+            self.status_bar.SetStatusText(f"Chat saved: {Path(filepath).name}")
+            wx.MessageBox("Chat saved successfully", "Success", MSG_INFO)
+        else:
+            wx.MessageBox("Error saving chat", "Error", MSG_ERROR)
+    
+    def apply_settings(self):
+        """Apply saved settings that affect the main window"""
+        config = load_config()
+        self.generation_options = generation_options(config)
+        if not config.get("autosave", False):
+            self._autosave_timer.Stop()
+        elif not self._autosave_timer.IsRunning():
+            self._autosave_timer.Start(AUTOSAVE_INTERVAL_MS)
+    
+    def on_autosave(self, event):
+        """Save changes to the current chat file, if it is one that is safe to overwrite"""
+        if not self._autosave_path or not self._dirty:
+            return
+        # save_chat writes compact JSON lines in a single write, so this is cheap to run often
+        model = self.model_choice.GetStringSelection()
+        if ChatManager.save_chat(self._autosave_path, self.messages, model):
+            self._mark_saved()
+            self.status_bar.SetStatusText(f"Chat auto-saved: {Path(self._autosave_path).name}")
+    
+    def forget_chat_file(self, path):
+        """Stop autosaving to a chat file that has been deleted"""
+        if self._autosave_path and os.path.abspath(self._autosave_path) == os.path.abspath(path):
+            self._autosave_path = None
     
     def load_chat_data(self, chat, filepath=None):
         """Load chat data into display"""
-        self.chat_display.Clear()
-        self.messages = chat.get("messages", [])
+        self._set_messages(chat.get("messages") or MessageLog())
         self.current_chat_file = filepath
-        self.is_saved = True
+        self._autosave_path = filepath if chat.get("jsonl") else None
         
         # Set model if it's available
         model_name = chat.get("model", "Unknown")
@@ -855,117 +1390,149 @@ class MainFrame(wx.Frame):
             if index != wx.NOT_FOUND:
                 self.model_choice.SetSelection(index)
         
-        for msg in self.messages:
-            role = msg.get("role", "Unknown").capitalize()
-            content = msg.get("content", "")
-            self.chat_display.AppendText(f"{role}: {content}\n\n")
+        # Replace the display contents in one update; ChangeValue sends no EVT_TEXT
+        transcript = ''.join(
+            f"{ROLE_LABELS.get(role) or role.capitalize()}: {content}\n\n"
+            for role, content in self.messages
+        )
+        self.chat_display.ChangeValue(transcript[-MAX_DISPLAY_CHARS:])
         
         self.status_bar.SetStatusText(f"Loaded: {chat.get('name', 'Chat')}")
     
     def show_options_menu(self):
         """Show options menu"""
-        # Create a popup menu
-        menu = wx.Menu()
-        
-        settings_id = wx.NewId()
-        manager_id = wx.NewId()
-        history_id = wx.NewId()
-        delete_id = wx.NewId()
-        exit_id = wx.NewId()
-        
-        menu.Append(settings_id, "Settings")
-        menu.Append(manager_id, "Model Manager")
-        menu.Append(history_id, "Chat History")
-        menu.Append(delete_id, "Delete Current Chat")
-        menu.AppendSeparator()
-        menu.Append(exit_id, "Exit")
-        
-        # Bind the events
-        self.Bind(wx.EVT_MENU, lambda e: self.show_settings(), id=settings_id)
-        self.Bind(wx.EVT_MENU, lambda e: self.show_model_manager(), id=manager_id)
-        self.Bind(wx.EVT_MENU, lambda e: self.show_chat_history(), id=history_id)
-        self.Bind(wx.EVT_MENU, lambda e: self.on_delete_current_chat(), id=delete_id)
-        self.Bind(wx.EVT_MENU, lambda e: self.on_exit(None), id=exit_id)
-        
-        # Show the popup menu
-        self.PopupMenu(menu)
-        menu.Destroy()
-    
-    def show_settings(self):
+        self.PopupMenu(self._popup_menu)
+    
+    def show_settings(self, event=None):
         """Show settings dialog"""
-        dlg = SettingsDialog(self, self.tts_manager)
-        dlg.ShowModal()
-        dlg.Destroy()
+        with SettingsDialog(self, self.tts_manager) as dlg:
+            dlg.ShowModal()
+        self.apply_settings()
     
-    def show_model_manager(self):
+    def show_model_manager(self, event=None):
         """Show model manager dialog"""
-        dlg = ModelManagerDialog(self)
-        dlg.ShowModal()
-        dlg.Destroy()
-        self.load_models()
+        with ModelManagerDialog(self) as dlg:
+            dlg.ShowModal()
+        # Let the dialog teardown repaint before refreshing the model list
+        wx.CallAfter(self.load_models)
     
-    def show_chat_history(self):
+    def show_chat_history(self, event=None):
         """Show chat history dialog"""
-        dlg = ChatHistoryDialog(self)
-        dlg.ShowModal()
-        dlg.Destroy()
+        with ChatHistoryDialog(self) as dlg:
+            if dlg.ShowModal() == wx.ID_OK:
+                selected = dlg.get_selection()
+            else:
+                return
+        
+        # Apply the chat after the dialog has been torn down and repainted
+        wx.CallAfter(self._apply_loaded_chat, *selected)
     
-    def on_delete_current_chat(self):
+    def _apply_loaded_chat(self, chat, filepath):
+        """Load a chat chosen in the history dialog, repainting the frame once"""
+        if chat.get("needs_migration"):
+            ChatManager.migrate_chat(filepath, chat)
+        self.Freeze()
+        try:
+            self.load_chat_data(chat, filepath)
+        finally:
+            self.Thaw()
+    
+    def on_delete_current_chat(self, event=None):
         """Delete current chat"""
-        if not self.is_saved or not self.current_chat_file:
-            wx.MessageBox(
-                "The current chat has not been saved. Only saved chats can be deleted.",
-                "Chat Not Saved",
-                wx.OK | wx.ICON_ERROR
-            )
+        if self._dirty or not self.current_chat_file:
+            wx.MessageBox(CHAT_NOT_SAVED_MESSAGE, CHAT_NOT_SAVED_TITLE, MSG_ERROR)
             return
         
-        dlg = wx.MessageDialog(
-            self,
-            f"Delete this chat? This cannot be undone.",
-            "Confirm Delete",
-            wx.YES_NO | wx.ICON_QUESTION
-        )
+        with CONFIRM_DIALOG(self, DELETE_CHAT_MESSAGE, DELETE_CHAT_TITLE, MSG_CONFIRM_DELETE) as dlg:
+            if dlg.ShowModal() != wx.ID_YES:
+                return
+        
+        # Delete on a worker thread; large files on slow disks can take a while
+        path = self.current_chat_file
+        self.forget_chat_file(path)
         
-        if dlg.ShowModal() == wx.ID_YES:
+        def delete_file():
             try:
-                Path(self.current_chat_file).unlink()
-                self.on_new_chat(None)
-                self.status_bar.SetStatusText("Chat deleted")
-                wx.MessageBox("Chat deleted successfully", "Success", wx.OK | wx.ICON_INFORMATION)
+                with suppress(FileNotFoundError):
+                    os.unlink(path)
             except Exception as e:
-                wx.MessageBox(f"Error deleting chat: {e}", "Error", wx.OK | wx.ICON_ERROR)
-            dlg.Destroy()
+                wx.CallAfter(self._on_delete_error, e)
+                return
+            wx.CallAfter(self._on_delete_done, path)
+        
+        self._pool.submit(delete_file)
+    
+    def _on_delete_done(self, path):
+        """Start a new chat once the current chat's file has been deleted"""
+        if self.current_chat_file != path:
+            # Another chat was opened while the file was being deleted; leave it alone
+            self.status_bar.SetStatusText(f"Deleted: {Path(path).name}")
+            return
+        if self._dirty:
+            # Messages were added meanwhile; keep them, but they no longer have a file
+            self.current_chat_file = None
+            self.status_bar.SetStatusText("Chat file deleted; current messages kept")
+            return
+        
+        # The status bar is the feedback channel; batch the repaint of both updates
+        self.Freeze()
+        try:
+            self.on_new_chat(None)
+            self.status_bar.SetStatusText("Chat deleted")
+        finally:
+            self.Thaw()
+    
+    def _on_delete_error(self, error):
+        """Report a failed chat deletion"""
+        wx.MessageBox(f"Error deleting chat: {error}", "Error", MSG_ERROR)
     
     def on_copy_response(self, event):
         """Copy assistant responses to clipboard"""
-        assistant_messages = [msg.get("content", "") for msg in self.messages if msg.get("role") == "assistant"]
-        
-        if not assistant_messages:
-            wx.MessageBox("No model responses to copy", "No Responses", wx.OK | wx.ICON_WARNING)
+        if not self._assistant_responses:
+            wx.MessageBox("No model responses to copy", "No Responses", MSG_WARNING)
             return
         
-        # Join all responses with separator
-        copied_text = "\n" + "=" * 50 + "\n".join(assistant_messages)
+        # Repeated copies reuse the joined text until another response arrives
+        if self._copy_text is None:
+            self._copy_text = COPY_SEPARATOR.join(self._assistant_responses)
         
-        # Copy to clipboard
-        if wx.TheClipboard.Open():
-            wx.TheClipboard.SetData(wx.TextDataObject(copied_text))
-            wx.TheClipboard.Close()
+        if pyperclip is not None and sys.platform == "win32":
+            try:
+                pyperclip.copy(self._copy_text)
+                self.status_bar.SetStatusText("Model responses copied to clipboard")
+                return
+            except pyperclip.PyperclipException as e:
+                print(f"Error copying with pyperclip: {e}")
+        
+        # Copy to clipboard, building the data first so the clipboard is held only briefly.
+        # SetData takes ownership of the data object, so a new one is needed on every copy.
+        if wx.Platform == "__WXGTK__":
+            # GTK's text format is UTF-8, so hand over encoded bytes instead of a str
+            # that wx would convert again
+            data = wx.CustomDataObject(wx.DataFormat(wx.DF_UNICODETEXT))
+            data.SetData(self._copy_text.encode('utf-8'))
+        else:
+            data = wx.TextDataObject(self._copy_text)
+        clip = wx.TheClipboard
+        if clip.Open():
+            try:
+                clip.SetData(data)
+                # Hand the data to the OS so pastes don't call back into the app
+                clip.Flush()
+            finally:
+                clip.Close()
             self.status_bar.SetStatusText("Model responses copied to clipboard")
         else:
-            wx.MessageBox("Failed to access clipboard", "Error", wx.OK | wx.ICON_ERROR)
+            wx.MessageBox("Failed to access clipboard", "Error", MSG_ERROR)
     
     def on_speak_response(self, event):
         """Speak the last assistant response"""
-        assistant_messages = [msg.get("content", "") for msg in self.messages if msg.get("role") == "assistant"]
-        
-        if not assistant_messages:
-            wx.MessageBox("No model responses to speak", "No Responses", wx.OK | wx.ICON_WARNING)
+        if not self._assistant_responses:
+            wx.MessageBox("No model responses to speak", "No Responses", MSG_WARNING)
             return
         
         # Get the last response
-        last_response = assistant_messages[-1]
+        last_response = self._assistant_responses[-1]
         
         # Speak in a separate thread to avoid blocking UI
         def speak_thread():
@@ -979,22 +1546,30 @@ class MainFrame(wx.Frame):
     
     def on_exit(self, event):
         """Exit application"""
-        if self.messages and not self.is_saved:
-            dlg = wx.MessageDialog(
+        self.Close()
+    
+    def on_close(self, event):
+        """Confirm unsaved changes, then stop background work and close the window"""
+        if self._dirty and event.CanVeto():
+            with wx.MessageDialog(
                 self,
                 "Unsaved changes. Exit without saving?",
                 "Confirm Exit",
-                wx.YES_NO | wx.ICON_QUESTION
-            )
-            result = dlg.ShowModal()
-            dlg.Destroy()
+                MSG_CONFIRM
+            ) as dlg:
+                result = dlg.ShowModal()
             
             if result != wx.ID_YES:
+                event.Veto()
                 return
         
         # Stop TTS if speaking
         self.tts_manager.stop()
-        self.Close(True)
+        self._stream_timer.Stop()
+        self._autosave_timer.Stop()
+        OllamaManager.stop_streams()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        event.Skip()
 
 
 class OllamaChatApp(wx.App):
@@ -1013,5 +1588,5 @@ def main():
     app.MainLoop()
 
 
-if __name_        _ == "__main__":
+if __name__ == "__main__":
     main()
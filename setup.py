@@ -0,0 +1,14 @@
+"""
+Builds the optional compiled stream decoder used by ollama_chat.py.
+
+    pip install cython
+    python setup.py build_ext --inplace
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="ollama-chat-fastdecode",
+    ext_modules=cythonize("fastdecode.pyx"),
+)